@@ -0,0 +1,5 @@
+from . import filter, utils
+from .pdf import PDF
+from .signature import Signature
+
+__all__ = ["PDF", "Signature", "filter", "utils"]
@@ -1,6 +1,6 @@
 import abc
 import random
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
 
 import numpy as np
 from PIL import Image, ImageFilter, ImageOps
@@ -92,3 +92,17 @@ class Noise(Filter):
         salt_mask = np.random.random(image_array.shape[:2]) < (self.strength / 1000)
         image_array[salt_mask] = np.random.randint(0, 255)
         return Image.fromarray(image_array)
+
+
+def default_filters() -> List[Filter]:
+    return [
+        Grayscale("Grayscale", enabled=True),
+        Noise("Noise", enabled=False, initial_strength=0.1, strength_range=(0, 1)),
+        Blur("Blur", enabled=False, initial_strength=1, strength_range=(0, 5)),
+        Rotate("Random rotate", enabled=True, initial_strength=1, strength_range=(0, 10)),
+        AutoContrast("Autocontrast cutoff", enabled=True, initial_strength=2, strength_range=(0, 45)),
+    ]
+
+
+def renders_grayscale(filters: List[Filter]) -> bool:
+    return any(isinstance(filter_, Grayscale) and filter_.enabled for filter_ in filters)
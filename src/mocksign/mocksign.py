@@ -1,18 +1,34 @@
 import ctypes
+import io
 import os
 import pathlib as pl
 import platform
+import queue
+import threading
+import time
 from enum import Enum
 from functools import partial
-from typing import Any, Callable, Dict, Optional, Tuple
+from typing import Any, Callable, Dict, Generator, List, Optional, Tuple
 
 import FreeSimpleGUI as sg
 from PIL import Image
+from PIL.Image import Resampling
 
-from . import filter, utils
-from .pdf import PDF
+from . import filter, thumbnails, utils
+from .pdf import PDF, get_page_count
 from .signature import Signature
 
+RESIZE_DEBOUNCE_SECONDS = 0.15
+SAVE_POLL_INTERVAL_MS = 100
+PAGE_FIGURE_CACHE_SIZE = 16
+TILE_SIZE = 256
+TILE_CACHE_SIZE = 128
+ZOOM_STEP = 1.25
+MAX_ZOOM_LEVEL = 16.0
+THUMBNAIL_MARGIN = 8
+THUMBNAIL_STRIP_WIDTH = thumbnails.THUMBNAIL_SIZE[0] + 2 * THUMBNAIL_MARGIN
+THUMBNAIL_SLOT_HEIGHT = thumbnails.THUMBNAIL_SIZE[1] + 2 * THUMBNAIL_MARGIN
+
 
 class Mode(Enum):
     EDIT = 1
@@ -36,14 +52,27 @@ class MockSign:
         self._scaling_factor: float = 1.0
         self._pdf: PDF = None  # type: ignore
         self._mode: Mode = Mode.EDIT
-
-        self._filters = [
-            filter.Grayscale("Grayscale", enabled=True),
-            filter.Noise("Noise", enabled=False, initial_strength=0.1, strength_range=(0, 1)),
-            filter.Blur("Blur", enabled=False, initial_strength=1, strength_range=(0, 5)),
-            filter.Rotate("Random rotate", enabled=True, initial_strength=1, strength_range=(0, 10)),
-            filter.AutoContrast("Autocontrast cutoff", enabled=True, initial_strength=2, strength_range=(0, 45)),
-        ]
+        self._resize_pending_since: Optional[float] = None
+        self._zoom_level: float = 1.0
+        self._view_center: Optional[Tuple[float, float]] = None
+        self._page_figure_cache: utils.LRUCache[Tuple[int, utils.Viewport], bytes] = utils.LRUCache(
+            PAGE_FIGURE_CACHE_SIZE
+        )
+        self._tile_cache: utils.LRUCache[Tuple[int, float, int, int], Image.Image] = utils.LRUCache(TILE_CACHE_SIZE)
+        self._preview_image: Optional[Tuple[int, Image.Image]] = None
+        self._pan_position: Tuple[int, int] = (0, 0)
+        self._page_figure: Optional[Tuple[bytes, utils.Viewport]] = None
+        self._placeholder_source: Optional[Image.Image] = None
+        self._save_thread: Optional[threading.Thread] = None
+        self._thumbnails_graph: sg.Graph = None  # type: ignore
+        self._thumbnails: Dict[int, bytes] = {}
+        self._thumbnail_scroll: int = 0
+        self._thumbnail_generation: int = 0
+        self._thumbnail_cancel_event = threading.Event()
+        self._save_cancel_event = threading.Event()
+        self._save_events: "queue.Queue[Tuple[str, Any]]" = queue.Queue()
+
+        self._filters = filter.default_filters()
 
     def _create_window(self) -> sg.Window:
         mode_options = [
@@ -121,6 +150,14 @@ class MockSign:
                                 key="-PDF-FILE-", file_types=[("PDF", "*.pdf")], target="-PDF-FILE-", enable_events=True
                             ),
                         ],
+                        [
+                            sg.Text("Pages:"),
+                            sg.Input(
+                                key="-PAGES-",
+                                expand_x=True,
+                                tooltip="Pages to load, e.g. 1-3, 5, 8-. Leave empty to load all pages.",
+                            ),
+                        ],
                     ],
                     expand_x=True,
                     pad=10,
@@ -151,11 +188,29 @@ class MockSign:
                     pad=10,
                 ),
             ],
-            [sg.Button("Save pdf...", key="-SAVE-", disabled=True)],
+            [
+                sg.Button("Save pdf...", key="-SAVE-", disabled=True),
+                sg.ProgressBar(
+                    max_value=1,
+                    orientation="horizontal",
+                    size=(15, 15),
+                    key="-SAVE-PROGRESS-",
+                    visible=False,
+                ),
+                sg.Button("Cancel", key="-SAVE-CANCEL-", visible=False),
+            ],
         ]
 
         col_right = [
             [
+                sg.Graph(
+                    canvas_size=(THUMBNAIL_STRIP_WIDTH, 400),
+                    graph_bottom_left=(0, 400),
+                    graph_top_right=(THUMBNAIL_STRIP_WIDTH, 0),
+                    expand_y=True,
+                    key="-THUMBNAILS-",
+                    enable_events=True,
+                ),
                 sg.Graph(
                     canvas_size=(400, 400),
                     graph_bottom_left=(0, 0),
@@ -166,12 +221,15 @@ class MockSign:
                     enable_events=True,
                     drag_submits=True,
                     motion_events=True,
-                )
+                ),
             ],
             [
                 sg.Button("<", key="-PREVIOUS-"),
                 sg.Text("", key="-CURRENT-PAGE-"),
                 sg.Button(">", key="-NEXT-"),
+                sg.Button("-", key="-ZOOM-OUT-"),
+                sg.Button("Fit", key="-ZOOM-FIT-"),
+                sg.Button("+", key="-ZOOM-IN-"),
             ],
         ]
 
@@ -235,6 +293,9 @@ class MockSign:
     def _update_page_navigation(self) -> None:
         if self._pdf and self._pdf.loaded:
             description = f"Page {self._current_page + 1}/{self._pdf.num_pages}"
+            page_indices = self._pdf.page_indices
+            if page_indices != list(range(self._pdf.num_pages)):
+                description += f" (document page {page_indices[self._current_page] + 1})"
             self._window["-CURRENT-PAGE-"].update(description)
             self._window["-PREVIOUS-"].update(disabled=self._current_page == 0)
             self._window["-NEXT-"].update(disabled=self._current_page == self._pdf.num_pages - 1)
@@ -243,37 +304,141 @@ class MockSign:
             self._window["-PREVIOUS-"].update(disabled=True)
             self._window["-NEXT-"].update(disabled=True)
 
-    def _update_page(self, page_image: Image.Image) -> None:
-        new_page_image = page_image.copy()
-
-        if self._mode == Mode.PREVIEW:
-            for filter_ in self._filters:
-                new_page_image = filter_.apply(new_page_image)
+    def _calculate_viewport(self, graph_size: Tuple[int, int]) -> utils.Viewport:
+        page_size = self._pdf.get_page_size(self._current_page)
+        return utils.calculate_viewport(page_size, graph_size, zoom=self._zoom_level, center=self._view_center)
 
+    def _update_page_coordinates(self, viewport: utils.Viewport) -> None:
         # Match document coordinate system
-        graph_size = self._graph.get_size()
-        self._graph.CanvasSize = graph_size  # https://github.com/PySimpleGUI/PySimpleGUI/issues/6451
-        self._scaling_factor = utils.calculate_padded_image_coordinates(new_page_image.size, graph_size).scale
-        h_offset = ((graph_size[0] * self._scaling_factor) - new_page_image.width) / 2
-        v_offset = ((graph_size[1] * self._scaling_factor) - new_page_image.height) / 2
+        page_height = self._pdf.get_page_size(self._current_page)[1]
+        self._graph.CanvasSize = viewport.size  # https://github.com/PySimpleGUI/PySimpleGUI/issues/6451
+        self._scaling_factor = viewport.scale
         self._graph.change_coordinates(
-            graph_bottom_left=(-h_offset, -v_offset),
-            graph_top_right=(new_page_image.width + h_offset, new_page_image.height + v_offset),
+            graph_bottom_left=(viewport.left, page_height - viewport.bottom),
+            graph_top_right=(viewport.right, page_height - viewport.top),
         )
 
-        # Update page figure
-        new_page_image_resized = utils.resize_and_pad_image(new_page_image, target_size=graph_size)
+    def _draw_page_figure(self, viewport: utils.Viewport, page_bytes: bytes) -> None:
+        self._update_page_coordinates(viewport)
+        page_height = self._pdf.get_page_size(self._current_page)[1]
         if self._current_page_figure_id is not None:
             self._graph.delete_figure(self._current_page_figure_id)
         self._current_page_figure_id = self._graph.draw_image(
-            data=utils.image_to_bytes(new_page_image_resized), location=(-h_offset, v_offset + new_page_image.height)
+            data=page_bytes, location=(viewport.left, page_height - viewport.top)
         )
+        self._graph.send_figure_to_back(self._current_page_figure_id)
+
+    def _render_page_figure(self, viewport: utils.Viewport) -> bytes:
+        cache_key = (self._current_page, viewport)
+        page_bytes = self._page_figure_cache.get(cache_key)
+        if page_bytes is not None:
+            return page_bytes
+
+        if self._mode == Mode.PREVIEW:
+            page_image = utils.render_viewport(self._get_preview_image(), viewport)
+        else:
+            page_image = self._render_tiles(viewport)
+
+        page_bytes = utils.image_to_bytes(page_image)
+        self._page_figure_cache.put(cache_key, page_bytes)
+        return page_bytes
+
+    def _render_tiles(self, viewport: utils.Viewport) -> Image.Image:
+        page_size = self._pdf.get_page_size(self._current_page)
+        zoom = 1 / viewport.scale
+        offset = (round(viewport.left * zoom), round(viewport.top * zoom))
+
+        # Only the tiles within the viewport are rendered, straight from the document at the effective resolution
+        viewport_image = Image.new("RGB", viewport.size, "gray")
+        for column, row in utils.get_visible_tiles(page_size, viewport, TILE_SIZE):
+            cache_key = (self._current_page, round(zoom, 6), column, row)
+            tile = self._tile_cache.get(cache_key)
+            if tile is None:
+                tile = self._pdf.render_tile(self._current_page, zoom, column, row, TILE_SIZE)
+                self._tile_cache.put(cache_key, tile)
+            viewport_image.paste(tile, (column * TILE_SIZE - offset[0], row * TILE_SIZE - offset[1]))
+
+        return viewport_image
+
+    def _get_preview_image(self) -> Image.Image:
+        # Filters are applied to the whole page, which is kept while panning and zooming the same page
+        if self._preview_image is None or self._preview_image[0] != self._current_page:
+            page_image = self._pdf.get_page_image(self._current_page, signed=True)
+            for filter_ in self._filters:
+                page_image = filter_.apply(page_image)
+            self._preview_image = (self._current_page, page_image)
+
+        return self._preview_image[1]
+
+    def _invalidate_page_figure_cache(self) -> None:
+        self._page_figure_cache.clear()
+        self._tile_cache.clear()
+        self._preview_image = None
+
+    def _update_page(self) -> None:
+        viewport = self._calculate_viewport(self._graph.get_size())
+        page_bytes = self._render_page_figure(viewport)
+        self._draw_page_figure(viewport, page_bytes)
+        self._page_figure = (page_bytes, viewport)
+        self._placeholder_source = None
 
         self._update_page_navigation()
+        self._redraw_thumbnails()
 
         if self._mode == Mode.EDIT:
             self._redraw_page_signatures()
 
+    def _draw_resize_placeholder(self) -> None:
+        viewport = self._calculate_viewport(self._graph.get_size())
+
+        cached_page_bytes = self._page_figure_cache.get((self._current_page, viewport))
+        if cached_page_bytes is not None:
+            self._draw_page_figure(viewport, cached_page_bytes)
+            self._page_figure = (cached_page_bytes, viewport)
+            self._placeholder_source = None
+            return
+
+        if self._page_figure is None:
+            return
+
+        # Cheaply rescale the last rendered page figure until resizing has settled
+        page_bytes, previous_viewport = self._page_figure
+        if self._placeholder_source is None:
+            self._placeholder_source = Image.open(io.BytesIO(page_bytes))
+        placeholder_viewport = utils.Viewport(
+            left=(viewport.left - previous_viewport.left) / previous_viewport.scale,
+            top=(viewport.top - previous_viewport.top) / previous_viewport.scale,
+            scale=viewport.scale / previous_viewport.scale,
+            size=viewport.size,
+        )
+        placeholder = utils.render_viewport(self._placeholder_source, placeholder_viewport, resample=Resampling.NEAREST)
+        self._draw_page_figure(viewport, utils.image_to_bytes(placeholder, compress_level=0))
+
+    def _set_view(self, zoom_level: float, center: Optional[Tuple[float, float]]) -> None:
+        if self._pdf is None or not self._pdf.loaded:
+            return
+
+        self._zoom_level = min(max(zoom_level, 1.0), MAX_ZOOM_LEVEL)
+        self._view_center = center
+        # Store the clamped center so that panning past the page edges does not accumulate
+        viewport = self._calculate_viewport(self._graph.get_size())
+        self._view_center = ((viewport.left + viewport.right) / 2, (viewport.top + viewport.bottom) / 2)
+        self._update_page()
+
+    def _zoom(self, factor: float, anchor: Optional[Tuple[float, float]] = None) -> None:
+        if self._pdf is None or not self._pdf.loaded:
+            return
+
+        # Zoom around the anchor in page image coordinates so that it stays at the same position on screen
+        viewport = self._calculate_viewport(self._graph.get_size())
+        center = ((viewport.left + viewport.right) / 2, (viewport.top + viewport.bottom) / 2)
+        if anchor is None:
+            anchor = center
+        new_zoom_level = min(max(self._zoom_level * factor, 1.0), MAX_ZOOM_LEVEL)
+        ratio = self._zoom_level / new_zoom_level
+        new_center = (anchor[0] + (center[0] - anchor[0]) * ratio, anchor[1] + (center[1] - anchor[1]) * ratio)
+        self._set_view(new_zoom_level, new_center)
+
     def _redraw_page_signatures(self) -> None:
         if self._pdf is None or not self._pdf.loaded:
             return
@@ -303,11 +468,7 @@ class MockSign:
         if self._pdf is None or not self._pdf.loaded:
             return
 
-        current_page_image = self._pdf.get_page_image(
-            page_number=self._current_page,
-            signed=self._mode == Mode.PREVIEW,
-        )
-        self._update_page(current_page_image)
+        self._update_page()
 
     def _on_graph_mouse_move(self, values: Dict[str, Any]) -> None:
         if not values["-PLACE-"]:
@@ -321,20 +482,50 @@ class MockSign:
         if self._floating_signature_figure_id is not None:
             self._graph.delete_figure(self._floating_signature_figure_id)
 
+    @staticmethod
+    def _is_mouse_wheel_up(graph: sg.Graph) -> bool:
+        if graph.user_bind_event.delta != 0:
+            return bool(graph.user_bind_event.delta > 0)
+
+        # Linux does not provide the delta value, so we need to infer it from the event number
+        return bool(graph.user_bind_event.num == 4)
+
     def _on_graph_mouse_wheel(self, values: Dict[str, Any]) -> None:
         if not values["-PLACE-"] or not self._selected_signature_image:
             return
 
-        if self._graph.user_bind_event.delta != 0:
-            is_mouse_wheel_up = self._graph.user_bind_event.delta > 0
-        else:
-            # Linux does not provide the delta value, so we need to infer it from the event number
-            is_mouse_wheel_up = self._graph.user_bind_event.num == 4
-        self._signature_zoom_level *= 1.1 if is_mouse_wheel_up else 0.9
+        self._signature_zoom_level *= 1.1 if self._is_mouse_wheel_up(self._graph) else 0.9
 
         cursor_xy = values["-GRAPH-"]
         self._place_floating_signature(self._selected_signature_image, cursor_xy)
 
+    def _on_graph_zoom_wheel(self, values: Dict[str, Any]) -> None:
+        if self._pdf is None or not self._pdf.loaded:
+            return
+
+        cursor_x, cursor_y = values["-GRAPH-"]
+        if cursor_x is None or cursor_y is None:
+            return
+
+        anchor = (cursor_x, self._pdf.get_page_size(self._current_page)[1] - cursor_y)
+        self._zoom(ZOOM_STEP if self._is_mouse_wheel_up(self._graph) else 1 / ZOOM_STEP, anchor=anchor)
+
+    def _on_graph_pan_start(self, _: Dict[str, Any]) -> None:
+        self._pan_position = (self._graph.user_bind_event.x, self._graph.user_bind_event.y)
+
+    def _on_graph_pan(self, _: Dict[str, Any]) -> None:
+        if self._pdf is None or not self._pdf.loaded or self._view_center is None:
+            return
+
+        position = (self._graph.user_bind_event.x, self._graph.user_bind_event.y)
+        delta = (position[0] - self._pan_position[0], position[1] - self._pan_position[1])
+        self._pan_position = position
+        center = (
+            self._view_center[0] - delta[0] * self._scaling_factor,
+            self._view_center[1] - delta[1] * self._scaling_factor,
+        )
+        self._set_view(self._zoom_level, center)
+
     def _on_graph_clicked(self, values: Dict[str, Any]) -> None:
         cursor_xy = values["-GRAPH-"]
         if values["-REMOVE-"]:
@@ -366,8 +557,11 @@ class MockSign:
             )
             self._floating_signature_figure_id = None  # Anchor floating signature
 
+        self._redraw_thumbnails()
+
     def _set_mode(self, mode: Mode) -> None:
         self._mode = mode
+        self._invalidate_page_figure_cache()
         self._update_current_page()
 
     def _on_save_clicked(self, _: Dict[str, Any]) -> None:
@@ -379,32 +573,303 @@ class MockSign:
             return
 
         filename = sg.popup_get_file("Save pdf...", save_as=True)
-        if filename:
-            self._pdf.save(path=pl.Path(filename), filters=self._filters)
+        if not filename:
+            return
+
+        page_ranges = sg.popup_get_text(
+            "Pages to save, e.g. 1-3, 5, numbered as in the document.\n"
+            "Separate ranges with ';' to save them to separate files. Leave empty to save all loaded pages.",
+            title="Pages to save",
+        )
+        if page_ranges is None:
+            return
+
+        try:
+            page_groups = [
+                utils.parse_loaded_page_ranges(group, self._pdf.page_indices)
+                for group in page_ranges.split(";")
+                if group.strip()
+            ] or [list(range(self._pdf.num_pages))]
+        except ValueError as e:
+            sg.popup_error(str(e), title="Invalid page range")
+            return
+
+        path = pl.Path(filename)
+        paths = (
+            [path]
+            if len(page_groups) == 1
+            else [path.with_name(f"{path.stem}_{i + 1}{path.suffix}") for i in range(len(page_groups))]
+        )
+        # The save dialog only confirmed the chosen file, not the numbered files derived from it
+        existing_files = [output_path.name for output_path in paths if output_path.exists()] if len(paths) > 1 else []
+        if existing_files:
+            answer = sg.popup_yes_no(
+                "The following files already exist. Do you want to replace them?\n" + "\n".join(existing_files),
+                title="Replace files",
+            )
+            if answer != "Yes":
+                return
+
+        self._save_cancel_event = threading.Event()
+        saves = [
+            self._pdf.save_with_progress(
+                path=output_path, filters=self._filters, pages=pages, cancel_event=self._save_cancel_event
+            )
+            for output_path, pages in zip(paths, page_groups)
+        ]
+        self._save_thread = threading.Thread(
+            target=self._save_in_background,
+            args=(saves, sum(len(pages) + 1 for pages in page_groups), self._save_cancel_event),
+            daemon=True,
+        )
+        self._set_saving(True)
+        self._save_thread.start()
+
+    def _save_in_background(
+        self,
+        saves: List[Generator[Tuple[int, int], None, None]],
+        total_steps: int,
+        cancel_event: threading.Event,
+    ) -> None:
+        # Output files are saved one after another, with progress reported across all of them
+        error: Optional[str] = None
+        completed_steps = 0
+        try:
+            for progress in saves:
+                for step, num_steps in progress:
+                    if cancel_event.is_set():
+                        return
+                    self._save_events.put(("-SAVE-STEP-", (completed_steps + step, total_steps)))
+                completed_steps += num_steps
+        except Exception as e:
+            error = f"Could not save pdf: {e}"
+        finally:
+            # Closing the iterators stops the save between pages without writing the current output file
+            for progress in saves:
+                progress.close()
+            # Also reported when cancelled, so that the save is only considered done once no more files are written
+            self._save_events.put(("-SAVE-FINISHED-", error))
+
+    def _set_saving(self, value: bool) -> None:
+        self._window["-SAVE-"].update(disabled=value)
+        self._window["-SAVE-PROGRESS-"].update(current_count=0, max=1, visible=value)
+        self._window["-SAVE-CANCEL-"].update(disabled=False, visible=value)
+
+    def _handle_save_events(self) -> None:
+        # The save thread reports through a queue instead of window events. Posting a window event waits for the main
+        # thread to process it, which would never happen while the main thread waits for the save thread on exit.
+        while self._running:
+            try:
+                event, value = self._save_events.get_nowait()
+            except queue.Empty:
+                return
+            self._event_handlers[event]({event: value})
+
+    def _on_save_step(self, values: Dict[str, Any]) -> None:
+        step, num_steps = values["-SAVE-STEP-"]
+        self._window["-SAVE-PROGRESS-"].update(current_count=step, max=num_steps)
+
+    def _on_save_finished(self, values: Dict[str, Any]) -> None:
+        self._save_thread = None
+        self._set_saving(False)
+
+        error = values["-SAVE-FINISHED-"]
+        if error is not None:
+            sg.popup_error(error, title="Saving failed")
+
+    def _on_save_cancel_clicked(self, _: Dict[str, Any]) -> None:
+        if self._save_thread is None:
+            return
+
+        # The save stops at the next page or before writing its output file, and then reports back as finished
+        self._save_cancel_event.set()
+        self._window["-SAVE-CANCEL-"].update(disabled=True)
 
     def _navigate_page(self, delta: int) -> None:
+        self._go_to_page(self._current_page + delta)
+
+    def _go_to_page(self, page_number: int) -> None:
         if self._pdf is None or not self._pdf.loaded:
             return
 
-        new_page_number = self._current_page + delta
-        if new_page_number < 0 or new_page_number >= self._pdf.num_pages:
+        if page_number < 0 or page_number >= self._pdf.num_pages or page_number == self._current_page:
             return
 
         for id_ in self._pdf.get_page_signature_ids(self._current_page):
             self._graph.delete_figure(id_)
-        self._current_page = new_page_number
-        new_page_image = self._pdf.get_page_image(self._current_page, signed=self._mode == Mode.PREVIEW)
-        self._update_page(new_page_image)
+        self._current_page = page_number
+        self._scroll_thumbnails_to_current_page()
+        self._update_page()
+
+    def _start_thumbnail_worker(self) -> None:
+        self._thumbnail_cancel_event.set()
+        self._thumbnail_cancel_event = threading.Event()
+        self._thumbnail_generation += 1
+        self._thumbnails = {}
+        self._thumbnail_scroll = 0
+
+        threading.Thread(
+            target=self._render_thumbnails_in_background,
+            args=(self._pdf.path, self._pdf.page_indices, self._thumbnail_generation, self._thumbnail_cancel_event),
+            daemon=True,
+        ).start()
+
+    def _render_thumbnails_in_background(
+        self,
+        path: pl.Path,
+        page_indices: List[int],
+        generation: int,
+        cancel_event: threading.Event,
+    ) -> None:
+        rendered_thumbnails = thumbnails.iter_thumbnails(path, page_indices)
+        try:
+            for page_number, data in rendered_thumbnails:
+                if cancel_event.is_set():
+                    return
+                self._window.write_event_value("-THUMBNAIL-", (generation, page_number, data))
+        except Exception as e:
+            print(f"Could not render thumbnails: {e}")
+        finally:
+            rendered_thumbnails.close()
+
+    def _on_thumbnail_rendered(self, values: Dict[str, Any]) -> None:
+        generation, page_number, data = values["-THUMBNAIL-"]
+        if generation != self._thumbnail_generation:
+            return  # Thumbnail of a previously loaded document
+
+        self._thumbnails[page_number] = data
+        if self._thumbnail_scroll <= page_number < self._thumbnail_scroll + self._num_visible_thumbnails():
+            self._redraw_thumbnails()
+
+    def _num_visible_thumbnails(self) -> int:
+        return int(self._thumbnails_graph.get_size()[1] // THUMBNAIL_SLOT_HEIGHT) + 1
+
+    def _scroll_thumbnails_to_current_page(self) -> None:
+        num_fully_visible = max(self._num_visible_thumbnails() - 1, 1)
+        if self._current_page < self._thumbnail_scroll:
+            self._thumbnail_scroll = self._current_page
+        elif self._current_page >= self._thumbnail_scroll + num_fully_visible:
+            self._thumbnail_scroll = self._current_page - num_fully_visible + 1
+
+    def _redraw_thumbnails(self) -> None:
+        graph = self._thumbnails_graph
+        graph.erase()
+        if self._pdf is None or not self._pdf.loaded:
+            return
+
+        # Use a top-down coordinate system matching the size of the strip
+        width, height = graph.get_size()
+        graph.CanvasSize = (width, height)  # https://github.com/PySimpleGUI/PySimpleGUI/issues/6451
+        graph.change_coordinates(graph_bottom_left=(0, height), graph_top_right=(width, 0))
+
+        thumbnail_width, thumbnail_height = thumbnails.THUMBNAIL_SIZE
+        page_indices = self._pdf.page_indices
+        last_page = min(self._pdf.num_pages, self._thumbnail_scroll + self._num_visible_thumbnails())
+        for page_number in range(self._thumbnail_scroll, last_page):
+            left = THUMBNAIL_MARGIN
+            top = (page_number - self._thumbnail_scroll) * THUMBNAIL_SLOT_HEIGHT + THUMBNAIL_MARGIN
+            bottom_right = (left + thumbnail_width, top + thumbnail_height)
+
+            data = self._thumbnails.get(page_number)
+            if data is not None:
+                graph.draw_image(data=data, location=(left, top))
+            else:
+                graph.draw_rectangle((left, top), bottom_right, fill_color="white", line_color="gray")
+
+            if page_number == self._current_page:
+                graph.draw_rectangle(
+                    (left - 3, top - 3), (bottom_right[0] + 3, bottom_right[1] + 3), line_color="blue", line_width=2
+                )
+            if self._pdf.get_page_signatures(page_number):
+                graph.draw_circle((bottom_right[0] - 8, top + 8), 5, fill_color="red", line_color="red")
+            graph.draw_text(
+                str(page_indices[page_number] + 1),
+                (left + 4, bottom_right[1] - 4),
+                text_location=sg.TEXT_LOCATION_BOTTOM_LEFT,
+                font="Any 8",
+            )
+
+    def _on_thumbnails_clicked(self, values: Dict[str, Any]) -> None:
+        _, y = values["-THUMBNAILS-"]
+        if y is None:
+            return
+
+        self._go_to_page(self._thumbnail_scroll + int(y // THUMBNAIL_SLOT_HEIGHT))
+
+    def _on_thumbnails_mouse_wheel(self, _: Dict[str, Any]) -> None:
+        if self._pdf is None or not self._pdf.loaded:
+            return
+
+        delta = -1 if self._is_mouse_wheel_up(self._thumbnails_graph) else 1
+        max_scroll = max(self._pdf.num_pages - self._num_visible_thumbnails() + 1, 0)
+        self._thumbnail_scroll = min(max(self._thumbnail_scroll + delta, 0), max_scroll)
+        self._redraw_thumbnails()
+
+    def _get_signatures_to_keep(
+        self, path: pl.Path, page_indices: List[int]
+    ) -> Tuple[List[Tuple[int, int, Signature]], int]:
+        if self._pdf is None or not self._pdf.loaded:
+            return [], 0
+
+        new_page_numbers = (
+            {page_index: page_number for page_number, page_index in enumerate(page_indices)}
+            if path == self._pdf.path
+            else {}
+        )
+        kept_signatures = []
+        num_discarded_signatures = 0
+        for page_number, page_index in enumerate(self._pdf.page_indices):
+            page_signatures = zip(
+                self._pdf.get_page_signature_ids(page_number), self._pdf.get_page_signatures(page_number)
+            )
+            for identifier, signature in page_signatures:
+                if page_index in new_page_numbers:
+                    kept_signatures.append((new_page_numbers[page_index], identifier, signature))
+                else:
+                    num_discarded_signatures += 1
+        return kept_signatures, num_discarded_signatures
 
     def _on_input_file_selected(self, values: Dict[str, Any]) -> None:
         input_file = values["-PDF-FILE-"]
         if not input_file:
             return
         filename = pl.Path(input_file)
-        self._pdf = PDF(filename, remove_signature_background=values["-REMOVE-BG-"])
+        try:
+            pages = utils.parse_page_ranges(values["-PAGES-"], get_page_count(filename))
+        except ValueError as e:
+            sg.popup_error(str(e), title="Invalid page range")
+            return
+
+        # Signatures are kept on the pages that stay loaded when the same document is loaded with other pages
+        kept_signatures, num_discarded_signatures = self._get_signatures_to_keep(filename, pages)
+        if num_discarded_signatures > 0:
+            answer = sg.popup_yes_no(
+                f"{num_discarded_signatures} placed signature(s) are on pages that will not be loaded. "
+                "Do you want to discard them?",
+                title="Discard signatures",
+            )
+            if answer != "Yes":
+                return
+
+        pdf = PDF(
+            filename,
+            remove_signature_background=values["-REMOVE-BG-"],
+            grayscale=filter.renders_grayscale(self._filters),
+            pages=pages,
+        )
+        for page_number, identifier, signature in kept_signatures:
+            pdf.place_signature(page_number=page_number, signature=signature, identifier=identifier)
+        if self._pdf is not None:
+            for id_ in self._pdf.get_page_signature_ids(self._current_page):
+                self._graph.delete_figure(id_)
+            self._pdf.close()
+        self._pdf = pdf
         self._current_page = 0
-        current_page_image = self._pdf.get_page_image(self._current_page, signed=self._mode == Mode.PREVIEW)
-        self._update_page(current_page_image)
+        self._zoom_level = 1.0
+        self._view_center = None
+        self._invalidate_page_figure_cache()
+        self._start_thumbnail_worker()
+        self._update_page()
         self._window["-PDF-FILE-TEXT-"].update(filename.name)
         self._window["-PDF-FILE-TEXT-"].set_tooltip(str(filename))
         self._window["-SAVE-"].update(disabled=False)
@@ -416,21 +881,40 @@ class MockSign:
 
         self._window_size = new_window_size
 
+        # Tk fires many configure events while resizing, so the page is only rendered once resizing has settled
         if self._pdf is not None and self._pdf.loaded:
-            current_page = self._pdf.get_page_image(self._current_page, signed=self._mode == Mode.PREVIEW)
-            self._update_page(current_page)
+            self._resize_pending_since = time.monotonic()
+            self._draw_resize_placeholder()
+
+    def _update_page_after_resize(self) -> Optional[int]:
+        # Returns the milliseconds left until resizing has settled, or None if no resize is pending
+        if self._resize_pending_since is None:
+            return None
+
+        remaining = RESIZE_DEBOUNCE_SECONDS - (time.monotonic() - self._resize_pending_since)
+        if remaining > 0:
+            return int(remaining * 1000) + 1
+
+        self._resize_pending_since = None
+        self._update_current_page()
+        return None
 
     def _set_filter_enabled(self, filter_: filter.Filter, value: bool) -> None:
         filter_.set_enabled(value)
+        if self._pdf:
+            self._pdf.set_grayscale(filter.renders_grayscale(self._filters))
+        self._invalidate_page_figure_cache()
         self._update_current_page()
 
     def _set_filter_strength(self, filter_: filter.Filter, value: float) -> None:
         filter_.set_strength(value)
+        self._invalidate_page_figure_cache()
         self._update_current_page()
 
     def _set_remove_background(self, event: Dict[str, Any]) -> None:
         if self._pdf:
             self._pdf.set_remove_signature_background(event["-REMOVE-BG-"])
+        self._invalidate_page_figure_cache()
         self._update_current_page()
 
     def _on_windown_closed(self, _: Dict[str, Any]) -> None:
@@ -450,19 +934,38 @@ class MockSign:
         self._window = self._create_window()
         self._window.bind("<Configure>", "-CONFIGURE-")
 
+        self._window["-PAGES-"].bind("<Return>", "+RETURN")
+
+        self._thumbnails_graph = self._window["-THUMBNAILS-"]
+        self._thumbnails_graph.bind("<MouseWheel>", "+WHEEL")  # Windows event
+        self._thumbnails_graph.bind("<Button-4>", "+WHEEL")  # Linux event
+        self._thumbnails_graph.bind("<Button-5>", "+WHEEL")  # Linux event
+
         self._graph = self._window["-GRAPH-"]
         self._graph.bind("<Leave>", "+LEAVE")
         self._graph.bind("<MouseWheel>", "+WHEEL")  # Windows event
         self._graph.bind("<Button-4>", "+WHEEL")  # Linux event
         self._graph.bind("<Button-5>", "+WHEEL")  # Linux event
+        self._graph.bind("<Control-MouseWheel>", "+ZOOM")  # Windows event
+        self._graph.bind("<Control-Button-4>", "+ZOOM")  # Linux event
+        self._graph.bind("<Control-Button-5>", "+ZOOM")  # Linux event
+        self._graph.bind("<ButtonPress-2>", "+PAN-START")
+        self._graph.bind("<B2-Motion>", "+PAN")
 
         self._event_handlers[sg.WIN_CLOSED] = self._on_windown_closed
         self._event_handlers["-CONFIGURE-"] = self._on_window_resized
         self._event_handlers["-GRAPH-+MOVE"] = self._on_graph_mouse_move
         self._event_handlers["-GRAPH-+LEAVE"] = self._on_graph_leave
         self._event_handlers["-GRAPH-+WHEEL"] = self._on_graph_mouse_wheel
+        self._event_handlers["-GRAPH-+ZOOM"] = self._on_graph_zoom_wheel
+        self._event_handlers["-GRAPH-+PAN-START"] = self._on_graph_pan_start
+        self._event_handlers["-GRAPH-+PAN"] = self._on_graph_pan
         self._event_handlers["-GRAPH-"] = self._on_graph_clicked
+        self._event_handlers["-THUMBNAILS-"] = self._on_thumbnails_clicked
+        self._event_handlers["-THUMBNAILS-+WHEEL"] = self._on_thumbnails_mouse_wheel
+        self._event_handlers["-THUMBNAIL-"] = self._on_thumbnail_rendered
         self._event_handlers["-PDF-FILE-"] = self._on_input_file_selected
+        self._event_handlers["-PAGES-+RETURN"] = self._on_input_file_selected
         self._event_handlers["-SIGNATURE-BROWSE-"] = self._load_signatures
         self._event_handlers["-DROPDOWN-"] = self._on_signature_selected
         self._event_handlers["-REMOVE-BG-"] = self._set_remove_background
@@ -471,7 +974,13 @@ class MockSign:
         self._event_handlers["-PREVIEW-"] = lambda _: self._set_mode(Mode.PREVIEW)
         self._event_handlers["-PREVIOUS-"] = lambda _: self._navigate_page(-1)
         self._event_handlers["-NEXT-"] = lambda _: self._navigate_page(1)
+        self._event_handlers["-ZOOM-IN-"] = lambda _: self._zoom(ZOOM_STEP)
+        self._event_handlers["-ZOOM-OUT-"] = lambda _: self._zoom(1 / ZOOM_STEP)
+        self._event_handlers["-ZOOM-FIT-"] = lambda _: self._set_view(1.0, None)
         self._event_handlers["-SAVE-"] = self._on_save_clicked
+        self._event_handlers["-SAVE-STEP-"] = self._on_save_step
+        self._event_handlers["-SAVE-FINISHED-"] = self._on_save_finished
+        self._event_handlers["-SAVE-CANCEL-"] = self._on_save_cancel_clicked
 
         for filter_ in self._filters:
             filter_name_key = filter_.__class__.__name__.upper()
@@ -490,10 +999,23 @@ class MockSign:
         self._update_page_navigation()
 
         while self._running:
-            event, values = self._window.read()
+            # Checked before every read rather than on timeouts only, as a steady stream of events such as mouse moves
+            # or thumbnails would otherwise keep the read from ever timing out
+            timeout = self._update_page_after_resize()
+            if self._save_thread is not None:
+                timeout = min(timeout, SAVE_POLL_INTERVAL_MS) if timeout is not None else SAVE_POLL_INTERVAL_MS
+            event, values = self._window.read(timeout=timeout)
             if event in self._event_handlers.keys():
                 self._event_handlers[event](values)
+            self._handle_save_events()
+
+        self._thumbnail_cancel_event.set()
+        if self._save_thread is not None:
+            self._save_cancel_event.set()
+            self._save_thread.join()
 
+        if self._pdf is not None:
+            self._pdf.close()
         self._window.close()
 
 
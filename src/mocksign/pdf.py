@@ -1,27 +1,135 @@
+import copy
+import ctypes
+import os
 import pathlib as pl
-from typing import Dict, List
+import tempfile
+import threading
+from types import ModuleType
+from typing import TYPE_CHECKING, Any, Dict, Generator, List, Optional, Sequence, Tuple
 
-import fitz
+import numpy as np
 from PIL import Image
 
 from . import filter
 from .signature import Signature
 
+if TYPE_CHECKING:
+    import fitz
+
+RENDER_DPI = 150
+
+# PyMuPDF must not be used from multiple threads at the same time
+FITZ_LOCK = threading.Lock()
+
+
+def load_fitz() -> ModuleType:
+    # PyMuPDF is only imported when a document is first opened, as loading it is slow
+    import fitz
+
+    return fitz
+
+
+def get_page_count(path: pl.Path) -> int:
+    fitz = load_fitz()
+    with FITZ_LOCK, fitz.Document(path) as document:
+        return int(document.page_count)
+
+
+def _wrap_pixmap(pixmap: "fitz.Pixmap", mode: str) -> Image.Image:
+    # Pillow only maps buffers of some modes instead of copying them. Grayscale pages wrap the pixmap samples, and the
+    # buffer holds a reference to the pixmap, so that its memory stays valid for as long as the image is alive. RGB is
+    # not one of these modes, so colour pages are copied once and the pixmap is released right away.
+    buffer = (ctypes.c_ubyte * (pixmap.stride * pixmap.height)).from_address(pixmap.samples_ptr)
+    setattr(buffer, "_pixmap", pixmap)
+    return Image.frombuffer(mode, (pixmap.width, pixmap.height), buffer, "raw", mode, pixmap.stride, 1)
+
+
+def _render_page(document: "fitz.Document", page_index: int, grayscale: bool) -> Image.Image:
+    fitz = load_fitz()
+    colorspace, mode = (fitz.csGRAY, "L") if grayscale else (fitz.csRGB, "RGB")
+    with FITZ_LOCK:
+        pixmap = document.load_page(page_index).get_pixmap(dpi=RENDER_DPI, colorspace=colorspace)
+    return _wrap_pixmap(pixmap, mode)
+
 
 class PDF:
-    def __init__(self, path: pl.Path, remove_signature_background: bool) -> None:
-        self._pages: List[Image.Image] = []
+    def __init__(
+        self,
+        path: pl.Path,
+        remove_signature_background: bool,
+        grayscale: bool = False,
+        pages: Optional[Sequence[int]] = None,
+    ) -> None:
+        self._path = path
+        # Indices of the loaded pages within the document. Page numbers used by all other methods refer to this list.
+        self._page_indices: List[int] = []
+        self._page_sizes: List[Tuple[int, int]] = []
+        # Pages are only rasterized when they are first needed, as rasterizing all pages of a large document takes long
+        self._pages: List[Optional[Image.Image]] = []
+        self._data = b""
+        self._document: Any = None
         self._remove_signature_background = remove_signature_background
+        self._grayscale = grayscale
 
-        document = fitz.Document(path)
-        for i in range(document.page_count):
-            page = document.load_page(i)
-            pixmap = page.get_pixmap(dpi=150)
-            image = Image.frombytes("RGB", (pixmap.width, pixmap.height), pixmap.samples)
-            self._pages.append(image)
+        if pages is not None and len(pages) == 0:
+            raise RuntimeError("No pages selected.")
+        self._open(pages)
 
         self._signatures: List[Dict[int, Signature]] = [{} for _ in self._pages]
 
+    def _open(self, page_indices: Optional[Sequence[int]]) -> None:
+        fitz = load_fitz()
+        # The document is kept open for rendering pages and tiles. It is read from memory, so that the file itself is
+        # not held open, which would keep it from being replaced on Windows, e.g. when saving over the input document.
+        data = self._path.read_bytes()
+
+        page_sizes = []
+        with FITZ_LOCK:
+            document = fitz.Document(stream=data, filetype="pdf")
+            try:
+                if page_indices is None:
+                    page_indices = range(document.page_count)
+                for i in page_indices:
+                    if not 0 <= i < document.page_count:
+                        raise RuntimeError(f"Page {i} does not exist in {self._path.name}.")
+
+                # The size of the rasterized page, without rasterizing it
+                matrix = fitz.Matrix(RENDER_DPI / 72, RENDER_DPI / 72)
+                for i in page_indices:
+                    rect = (document.load_page(i).rect * matrix).irect
+                    page_sizes.append((rect.width, rect.height))
+            except Exception:
+                document.close()
+                raise
+
+        self.close()
+        self._page_indices = list(page_indices)
+        self._page_sizes = page_sizes
+        self._pages = [None] * len(page_sizes)
+        self._data = data
+        self._document = document
+
+    def _get_page(self, page_number: int) -> Image.Image:
+        page = self._pages[page_number]
+        if page is None:
+            if self._document is None:
+                raise RuntimeError(f"{self._path.name} has been closed.")
+            page = _render_page(self._document, self._page_indices[page_number], self._grayscale)
+            self._pages[page_number] = page
+        return page
+
+    def close(self) -> None:
+        if self._document is not None:
+            with FITZ_LOCK:
+                self._document.close()
+            self._document = None
+
+    def __enter__(self) -> "PDF":
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
+
     def place_signature(self, page_number: int, signature: Signature, identifier: int) -> None:
         if page_number >= len(self._pages):
             raise RuntimeError(f"Page {page_number} does not exist.")
@@ -52,34 +160,171 @@ class PDF:
 
         self._signatures[page_number] = {}
 
-    def save(self, path: pl.Path, filters: List[filter.Filter]) -> None:
-        if len(self._pages) == 0:
+    def save(self, path: pl.Path, filters: List[filter.Filter], pages: Optional[Sequence[int]] = None) -> None:
+        for _ in self.save_with_progress(path, filters, pages=pages):
+            pass
+
+    def save_with_progress(
+        self,
+        path: pl.Path,
+        filters: List[filter.Filter],
+        pages: Optional[Sequence[int]] = None,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> Generator[Tuple[int, int], None, None]:
+        page_numbers = list(pages) if pages is not None else list(range(len(self._pages)))
+        if len(page_numbers) == 0:
             raise RuntimeError("Can not save empty document.")
+        for page_number in page_numbers:
+            if not 0 <= page_number < len(self._pages):
+                raise RuntimeError(f"Page {page_number} does not exist.")
 
-        signed_pages = [self.get_page_image(i, signed=True) for i in range(len(self._pages))]
+        # Take a snapshot of the current state so that editing can continue while the returned iterator is consumed.
+        # Pages that have not been rasterized yet are rasterized while saving, from a document of its own.
+        pages_to_save = [(self._pages[i], self._page_indices[i], self.get_page_signatures(i)) for i in page_numbers]
+        return self._save_pages(
+            path,
+            pages_to_save,
+            self._data,
+            self._grayscale,
+            copy.deepcopy(filters),
+            self._remove_signature_background,
+            cancel_event or threading.Event(),
+        )
+
+    @staticmethod
+    def _save_pages(
+        path: pl.Path,
+        pages: List[Tuple[Optional[Image.Image], int, List[Signature]]],
+        data: bytes,
+        grayscale: bool,
+        filters: List[filter.Filter],
+        remove_signature_background: bool,
+        cancel_event: threading.Event,
+    ) -> Generator[Tuple[int, int], None, None]:
+        num_steps = len(pages) + 1  # Encoding the document is the last step
 
         scanned_pages = []
-        for i, page in enumerate(signed_pages):
-            for filter_ in filters:
-                page = filter_.apply(page)
-            scanned_pages.append(page)
+        document: Any = None
+        try:
+            for i, (page, page_index, signatures) in enumerate(pages):
+                if cancel_event.is_set():
+                    return
+                if page is None:
+                    if document is None:
+                        with FITZ_LOCK:
+                            document = load_fitz().Document(stream=data, filetype="pdf")
+                    page = _render_page(document, page_index, grayscale)
+                page = PDF._draw_signatures(page, signatures, remove_signature_background)
+                for filter_ in filters:
+                    page = filter_.apply(page)
+                scanned_pages.append(page)
+                yield i + 1, num_steps
+        finally:
+            if document is not None:
+                with FITZ_LOCK:
+                    document.close()
+
+        if cancel_event.is_set():
+            return
+
+        # Write to a temporary file first so that a failed save never leaves a partially written document behind
+        fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+        os.close(fd)
+        try:
+            scanned_pages[0].save(temp_path, "PDF", resolution=100.0, save_all=True, append_images=scanned_pages[1:])
+            # The save may have been cancelled while encoding, in which case the output file is left untouched
+            if cancel_event.is_set():
+                return
+            os.replace(temp_path, path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        yield num_steps, num_steps
+
+    @staticmethod
+    def _draw_signatures(page: Image.Image, signatures: List[Signature], remove_background: bool) -> Image.Image:
+        # All signatures are drawn into a single working copy of the page, regardless of their number
+        if not remove_background or not signatures:
+            image = page.copy()
+            for signature in signatures:
+                signature.paste(image)
+            return image
 
-        scanned_pages[0].save(path, "PDF", resolution=100.0, save_all=True, append_images=scanned_pages[1:])
+        image_array = np.array(page.convert("RGB") if page.mode != "RGB" else page)
+        for signature in signatures:
+            signature.seamless_clone(image_array)
+
+        # Pillow can not map RGB arrays, so this copies the page once more. It is never needed per signature.
+        image = Image.fromarray(image_array)
+        return image.convert(page.mode) if page.mode != "RGB" else image
 
     def get_page_image(self, page_number: int, signed: bool) -> Image.Image:
         if page_number >= len(self._pages):
             raise RuntimeError(f"Page {page_number} does not exist.")
 
-        image = self._pages[page_number].copy()
-        if signed:
-            for signature in self.get_page_signatures(page_number):
-                image = signature.draw(image, remove_background=self._remove_signature_background)
+        signatures = self.get_page_signatures(page_number) if signed else []
+        return self._draw_signatures(
+            self._get_page(page_number), signatures, remove_background=self._remove_signature_background
+        )
+
+    def get_page_size(self, page_number: int) -> Tuple[int, int]:
+        if page_number >= len(self._pages):
+            raise RuntimeError(f"Page {page_number} does not exist.")
+
+        return self._page_sizes[page_number]
 
-        return image
+    def render_tile(self, page_number: int, zoom: float, column: int, row: int, tile_size: int) -> Image.Image:
+        fitz = load_fitz()
+        if page_number >= len(self._pages):
+            raise RuntimeError(f"Page {page_number} does not exist.")
+
+        # Tiles are laid out on the page image scaled by zoom and cut off at its right and bottom edges
+        page_width, page_height = self.get_page_size(page_number)
+        left, top = column * tile_size, row * tile_size
+        right = min(left + tile_size, round(page_width * zoom))
+        bottom = min(top + tile_size, round(page_height * zoom))
+        if right <= left or bottom <= top:
+            raise RuntimeError(f"Tile {column}, {row} is outside of page {page_number}.")
+        if self._document is None:
+            raise RuntimeError(f"{self._path.name} has been closed.")
+
+        # Tiles are only used for editing, so they are always rendered in colour regardless of the filters
+        with FITZ_LOCK:
+            page = self._document.load_page(self._page_indices[page_number])
+            points_per_pixel = 72 / (RENDER_DPI * zoom)
+            origin = page.rect.tl
+            clip = fitz.Rect(
+                origin.x + left * points_per_pixel,
+                origin.y + top * points_per_pixel,
+                origin.x + right * points_per_pixel,
+                origin.y + bottom * points_per_pixel,
+            )
+            pixmap = page.get_pixmap(
+                matrix=fitz.Matrix(1 / points_per_pixel, 1 / points_per_pixel), clip=clip, colorspace=fitz.csRGB
+            )
+            tile = Image.frombytes("RGB", (pixmap.width, pixmap.height), pixmap.samples, "raw", "RGB", pixmap.stride, 1)
+
+        # The clip is rounded to whole pixels by PyMuPDF, so tiles may be off by a pixel
+        if tile.size != (right - left, bottom - top):
+            tile = tile.resize((right - left, bottom - top))
+        return tile
 
     def set_remove_signature_background(self, value: bool) -> None:
         self._remove_signature_background = value
 
+    def set_grayscale(self, value: bool) -> None:
+        if value != self._grayscale:
+            self._grayscale = value
+            self._pages = [None] * len(self._pages)
+
+    @property
+    def path(self) -> pl.Path:
+        return self._path
+
+    @property
+    def page_indices(self) -> List[int]:
+        return list(self._page_indices)
+
     @property
     def num_pages(self) -> int:
         return len(self._pages)
@@ -0,0 +1,243 @@
+import argparse
+import dataclasses
+import json
+import os
+import pathlib as pl
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+from PIL import Image
+
+from . import filter
+from .pdf import PDF, load_fitz
+from .signature import Signature
+
+DEFAULT_SIGNATURE_DIR = pl.Path(__file__).parent / "signatures"
+SPEC_HEADER = "X-MockSign-Spec"
+
+
+class ServiceBusyError(RuntimeError):
+    pass
+
+
+@dataclasses.dataclass
+class SignaturePlacement:
+    page: int
+    signature: str
+    # Location of the top left corner in page pixels (150 dpi), measured from the bottom left page corner
+    location: Tuple[int, int]
+    scale: float = 1.0
+
+
+@dataclasses.dataclass
+class SigningSpec:
+    signatures: List[SignaturePlacement] = dataclasses.field(default_factory=list)
+    # Filter settings keyed by filter class name, e.g. {"Rotate": {"enabled": True, "strength": 2.0}}
+    filters: Dict[str, Dict[str, Any]] = dataclasses.field(default_factory=dict)
+    remove_signature_background: bool = True
+
+
+def parse_spec(data: Dict[str, Any]) -> SigningSpec:
+    if not isinstance(data, dict):
+        raise ValueError("Spec must be a JSON object.")
+
+    filter_names = {filter_.__class__.__name__ for filter_ in filter.default_filters()}
+    filters = data.get("filters", {})
+    if not isinstance(filters, dict):
+        raise ValueError("Spec field 'filters' must be an object.")
+    for name, settings in filters.items():
+        if name not in filter_names:
+            raise ValueError(f"Unknown filter {name}.")
+        if not isinstance(settings, dict) or not set(settings).issubset({"enabled", "strength"}):
+            raise ValueError(f"Invalid settings for filter {name}.")
+
+    placements = data.get("signatures", [])
+    if not isinstance(placements, list):
+        raise ValueError("Spec field 'signatures' must be a list.")
+
+    signatures = []
+    for placement in placements:
+        try:
+            signatures.append(
+                SignaturePlacement(
+                    page=int(placement["page"]),
+                    signature=str(placement["signature"]),
+                    location=(int(placement["location"][0]), int(placement["location"][1])),
+                    scale=float(placement.get("scale", 1.0)),
+                )
+            )
+        except (KeyError, IndexError, TypeError, ValueError) as e:
+            raise ValueError(f"Invalid signature placement {placement}.") from e
+
+    remove_signature_background = data.get("remove_signature_background", True)
+    if not isinstance(remove_signature_background, bool):
+        raise ValueError("Spec field 'remove_signature_background' must be a boolean.")
+
+    return SigningSpec(
+        signatures=signatures,
+        filters=filters,
+        remove_signature_background=remove_signature_background,
+    )
+
+
+# State of a pool worker process, populated once by _init_worker
+_worker_signatures: Dict[str, Image.Image] = {}
+
+
+def _init_worker(signature_dir: str) -> None:
+    # Load the lazily imported backends up front so that the first request does not pay for them
+    import cv2  # noqa: F401
+
+    load_fitz()
+
+    for file in sorted(pl.Path(signature_dir).glob("*")):
+        try:
+            image = Image.open(file)
+            image.load()
+        except OSError:
+            print(f"Could not open signature file {file.name}.")
+            continue
+        _worker_signatures[file.name] = image
+        _worker_signatures.setdefault(file.stem, image)
+
+
+def _ping() -> None:
+    pass
+
+
+def _configure_filters(settings: Dict[str, Dict[str, Any]]) -> List[filter.Filter]:
+    filters = filter.default_filters()
+    for filter_ in filters:
+        filter_settings = settings.get(filter_.__class__.__name__, {})
+        if "enabled" in filter_settings:
+            filter_.set_enabled(bool(filter_settings["enabled"]))
+        if "strength" in filter_settings:
+            filter_.set_strength(float(filter_settings["strength"]))
+    return filters
+
+
+def _sign_document(pdf_bytes: bytes, spec: SigningSpec) -> bytes:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        input_path = pl.Path(tmp_dir) / "input.pdf"
+        output_path = pl.Path(tmp_dir) / "output.pdf"
+        input_path.write_bytes(pdf_bytes)
+
+        filters = _configure_filters(spec.filters)
+        with PDF(
+            input_path,
+            remove_signature_background=spec.remove_signature_background,
+            grayscale=filter.renders_grayscale(filters),
+        ) as pdf:
+            for identifier, placement in enumerate(spec.signatures):
+                if placement.signature not in _worker_signatures:
+                    raise ValueError(f"Unknown signature {placement.signature}.")
+                if not 0 <= placement.page < pdf.num_pages:
+                    raise ValueError(f"Page {placement.page} does not exist.")
+                signature = Signature(
+                    image=_worker_signatures[placement.signature],
+                    location=placement.location,
+                    scale=placement.scale,
+                )
+                pdf.place_signature(page_number=placement.page, signature=signature, identifier=identifier)
+
+            pdf.save(output_path, filters=filters)
+        return output_path.read_bytes()
+
+
+class SigningService:
+    def __init__(self, signature_dir: pl.Path, max_workers: int, max_queue: int) -> None:
+        self._max_workers = max_workers
+        self._executor = ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_worker,
+            initargs=(str(signature_dir),),
+        )
+        # Requests beyond the running and queued ones are rejected instead of piling up
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+
+    def warm_up(self) -> None:
+        futures = [self._executor.submit(_ping) for _ in range(self._max_workers)]
+        for future in futures:
+            future.result()
+
+    def sign(self, pdf_bytes: bytes, spec: SigningSpec) -> bytes:
+        if not self._slots.acquire(blocking=False):
+            raise ServiceBusyError("Too many pending requests.")
+
+        try:
+            return self._executor.submit(_sign_document, pdf_bytes, spec).result()
+        finally:
+            self._slots.release()
+
+    def shutdown(self) -> None:
+        self._executor.shutdown()
+
+
+def _create_handler(service: SigningService) -> Type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self) -> None:
+            if self.path != "/sign":
+                self._send_error(HTTPStatus.NOT_FOUND, "Unknown endpoint.")
+                return
+
+            try:
+                pdf_bytes = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                spec = parse_spec(json.loads(self.headers.get(SPEC_HEADER, "{}")))
+                result = service.sign(pdf_bytes, spec)
+            except ServiceBusyError as e:
+                self._send_error(HTTPStatus.SERVICE_UNAVAILABLE, str(e))
+            except ValueError as e:
+                self._send_error(HTTPStatus.BAD_REQUEST, str(e))
+            except Exception as e:
+                self._send_error(HTTPStatus.INTERNAL_SERVER_ERROR, str(e))
+            else:
+                self.send_response(HTTPStatus.OK)
+                self.send_header("Content-Type", "application/pdf")
+                self.send_header("Content-Length", str(len(result)))
+                self.end_headers()
+                self.wfile.write(result)
+
+        def _send_error(self, status: HTTPStatus, message: str) -> None:
+            body = message.encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "text/plain; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    return Handler
+
+
+def serve(host: str, port: int, signature_dir: pl.Path, max_workers: int, max_queue: int) -> None:
+    service = SigningService(signature_dir, max_workers=max_workers, max_queue=max_queue)
+    service.warm_up()
+
+    server = ThreadingHTTPServer((host, port), _create_handler(service))
+    print(f"MockSign service listening on http://{host}:{port}/sign")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.shutdown()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Run MockSign as a local signing service.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--signatures", type=pl.Path, default=DEFAULT_SIGNATURE_DIR)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--queue", type=int, default=8, help="Maximum number of waiting requests.")
+    args = parser.parse_args(argv)
+
+    serve(args.host, args.port, args.signatures, max_workers=args.workers, max_queue=args.queue)
+
+
+if __name__ == "__main__":
+    main()
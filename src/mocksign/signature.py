@@ -1,33 +1,32 @@
 from typing import Optional, Tuple
 
-import cv2
 import numpy as np
-from cv2 import seamlessClone
 from PIL import Image
 
 
-def seamless_clone(image: Image.Image, signature: Image.Image, location: Tuple[int, int]) -> Image.Image:
+def seamless_clone(image_array: np.ndarray, signature: Image.Image, location: Tuple[int, int]) -> None:
+    import cv2  # Imported lazily as loading OpenCV is slow
+
+    # Clones the signature into the RGB image array in place
     x, y = location
     signature_width, signature_height = signature.size
-    signature_array = np.array(signature)
-    target_image = np.array(image)
+    signature_array = np.array(signature.convert("RGB") if signature.mode != "RGB" else signature)
 
     cropped_signature = signature_array[
-        : min(signature_height, target_image.shape[0] - y), : min(signature_width, target_image.shape[1] - x)
+        : min(signature_height, image_array.shape[0] - y), : min(signature_width, image_array.shape[1] - x)
     ]
     location_center = (x + cropped_signature.shape[1] // 2, y + cropped_signature.shape[0] // 2)
     mask = np.ones_like(cropped_signature) * 255
 
-    target_image = seamlessClone(
+    cv2.seamlessClone(
         src=cropped_signature,
-        dst=target_image,
+        dst=image_array,
         mask=mask,
         p=location_center,
         flags=cv2.MIXED_CLONE,
+        blend=image_array,
     )
 
-    return Image.fromarray(target_image)
-
 
 class Signature:
     def __init__(
@@ -59,11 +58,10 @@ class Signature:
             self._scaled_image_cache = None
             self._scaled_bytes_cache = None
 
-    def draw(self, image: Image.Image, remove_background: bool) -> Image.Image:
-        image = image.copy()
+    def paste(self, image: Image.Image) -> None:
         flipped_y_location = (self._location[0], image.size[1] - self._location[1])
-        if remove_background:
-            image = seamless_clone(image, self.get_scaled_signature(), flipped_y_location)
-        else:
-            image.paste(self.get_scaled_signature(), flipped_y_location)
-        return image
+        image.paste(self.get_scaled_signature(), flipped_y_location)
+
+    def seamless_clone(self, image_array: np.ndarray) -> None:
+        flipped_y_location = (self._location[0], image_array.shape[0] - self._location[1])
+        seamless_clone(image_array, self.get_scaled_signature(), flipped_y_location)
@@ -0,0 +1,65 @@
+import hashlib
+import os
+import pathlib as pl
+import tempfile
+from typing import Any, Generator, Optional, Sequence, Tuple
+
+from .pdf import FITZ_LOCK, load_fitz
+
+THUMBNAIL_SIZE = (80, 110)
+
+
+def get_cache_dir() -> pl.Path:
+    cache_home = os.environ.get("XDG_CACHE_HOME")
+    return (pl.Path(cache_home) if cache_home else pl.Path.home() / ".cache") / "mocksign" / "thumbnails"
+
+
+def hash_document(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _write_cache_file(path: pl.Path, data: bytes) -> None:
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "wb") as file:
+            file.write(data)
+        os.replace(temp_path, path)
+    except OSError as e:
+        print(f"Could not cache thumbnail {path.name}: {e}")
+
+
+def iter_thumbnails(
+    path: pl.Path,
+    page_indices: Sequence[int],
+    size: Tuple[int, int] = THUMBNAIL_SIZE,
+    cache_dir: Optional[pl.Path] = None,
+) -> Generator[Tuple[int, bytes], None, None]:
+    fitz = load_fitz()
+    # The document is read from memory, so that the file is not held open while thumbnails are rendered
+    data = path.read_bytes()
+    # Thumbnails are cached per document content, so they stay valid if the file is renamed or moved
+    document_cache_dir = (cache_dir or get_cache_dir()) / hash_document(data)
+
+    document: Any = None
+    try:
+        for page_number, page_index in enumerate(page_indices):
+            cache_path = document_cache_dir / f"{page_index}_{size[0]}x{size[1]}.png"
+            if cache_path.exists():
+                yield page_number, cache_path.read_bytes()
+                continue
+
+            # Render each page at the resolution that just fits the thumbnail size
+            with FITZ_LOCK:
+                if document is None:
+                    document = fitz.Document(stream=data, filetype="pdf")
+                page = document.load_page(page_index)
+                zoom = min(size[0] / page.rect.width, size[1] / page.rect.height)
+                data = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom)).tobytes("png")
+
+            _write_cache_file(cache_path, data)
+            yield page_number, data
+    finally:
+        if document is not None:
+            with FITZ_LOCK:
+                document.close()
@@ -1,8 +1,11 @@
 import dataclasses
 import io
-from typing import Tuple
+import math
+from collections import OrderedDict
+from typing import Generic, Hashable, List, Optional, Sequence, Tuple, TypeVar
 
 from PIL import Image
+from PIL.Image import Resampling
 
 
 @dataclasses.dataclass
@@ -43,19 +46,173 @@ def calculate_padded_image_coordinates(
         )
 
 
-def resize_and_pad_image(image: Image.Image, target_size: Tuple[int, int]) -> Image.Image:
+@dataclasses.dataclass(frozen=True)
+class Viewport:
+    # Top left corner of the viewport in page image coordinates
+    left: float
+    top: float
+    # Page image pixels per viewport pixel
+    scale: float
+    size: Tuple[int, int]
+
+    @property
+    def right(self) -> float:
+        return self.left + self.size[0] * self.scale
+
+    @property
+    def bottom(self) -> float:
+        return self.top + self.size[1] * self.scale
+
+
+def calculate_viewport(
+    image_size: Tuple[int, int],
+    target_size: Tuple[int, int],
+    zoom: float,
+    center: Optional[Tuple[float, float]],
+) -> Viewport:
+    scale = calculate_padded_image_coordinates(image_size, target_size).scale / zoom
+    width, height = target_size[0] * scale, target_size[1] * scale
+
+    # Keep the image centered along axes where it fits entirely, otherwise do not scroll past its edges
+    center_x, center_y = center if center is not None else (image_size[0] / 2, image_size[1] / 2)
+    if width >= image_size[0]:
+        center_x = image_size[0] / 2
+    else:
+        center_x = min(max(center_x, width / 2), image_size[0] - width / 2)
+    if height >= image_size[1]:
+        center_y = image_size[1] / 2
+    else:
+        center_y = min(max(center_y, height / 2), image_size[1] - height / 2)
+
+    return Viewport(left=center_x - width / 2, top=center_y - height / 2, scale=scale, size=target_size)
+
+
+def get_visible_tiles(image_size: Tuple[int, int], viewport: Viewport, tile_size: int) -> List[Tuple[int, int]]:
+    zoom = 1 / viewport.scale
+    left = max(viewport.left * zoom, 0)
+    top = max(viewport.top * zoom, 0)
+    right = min(viewport.right * zoom, round(image_size[0] * zoom))
+    bottom = min(viewport.bottom * zoom, round(image_size[1] * zoom))
+
+    return [
+        (column, row)
+        for row in range(int(top // tile_size), math.ceil(bottom / tile_size))
+        for column in range(int(left // tile_size), math.ceil(right / tile_size))
+    ]
+
+
+def render_viewport(
+    image: Image.Image,
+    viewport: Viewport,
+    resample: Resampling = Resampling.BICUBIC,
+) -> Image.Image:
+    target_image = Image.new("RGB", viewport.size, "gray")
+
+    box = (
+        max(viewport.left, 0),
+        max(viewport.top, 0),
+        min(viewport.right, image.width),
+        min(viewport.bottom, image.height),
+    )
+    width = round((box[2] - box[0]) / viewport.scale)
+    height = round((box[3] - box[1]) / viewport.scale)
+    if width <= 0 or height <= 0:
+        return target_image
+
+    resized = image.resize((width, height), resample=resample, box=box)
+    target_image.paste(
+        resized, (round((box[0] - viewport.left) / viewport.scale), round((box[1] - viewport.top) / viewport.scale))
+    )
+
+    return target_image
+
+
+def resize_and_pad_image(
+    image: Image.Image,
+    target_size: Tuple[int, int],
+    resample: Resampling = Resampling.BICUBIC,
+) -> Image.Image:
     image = image.copy()
 
     padded_image_coords = calculate_padded_image_coordinates(image.size, target_size)
 
     target_image = Image.new("RGB", target_size, "gray")
-    resized = image.resize((padded_image_coords.width, padded_image_coords.height))
+    resized = image.resize((padded_image_coords.width, padded_image_coords.height), resample=resample)
     target_image.paste(resized, (padded_image_coords.left_offset, padded_image_coords.top_offset))
 
     return target_image
 
 
-def image_to_bytes(image: Image.Image) -> bytes:
+def parse_page_ranges(text: str, num_pages: int) -> List[int]:
+    # Parses one-based, inclusive page ranges like "1-3, 5, 8-" into zero-based page numbers
+    if not text.strip():
+        return list(range(num_pages))
+
+    page_numbers: List[int] = []
+    for part in text.split(","):
+        if not part.strip():
+            continue
+
+        first, separator, last = part.strip().partition("-")
+        try:
+            start = int(first) if first.strip() else 1
+            end = (int(last) if last.strip() else num_pages) if separator else start
+        except ValueError as e:
+            raise ValueError(f"Invalid page range '{part.strip()}'.") from e
+
+        if not 1 <= start <= end <= num_pages:
+            raise ValueError(f"Page range '{part.strip()}' is outside of pages 1-{num_pages}.")
+        page_numbers.extend(page for page in range(start - 1, end) if page not in page_numbers)
+
+    if not page_numbers:
+        raise ValueError(f"Invalid page range '{text}'.")
+    return page_numbers
+
+
+def parse_loaded_page_ranges(text: str, page_indices: Sequence[int]) -> List[int]:
+    # Parses page ranges given in document page numbers into page numbers within the loaded pages
+    if not text.strip():
+        return list(range(len(page_indices)))
+
+    page_numbers = {page_index: page_number for page_number, page_index in enumerate(page_indices)}
+    loaded_page_numbers = []
+    for page_index in parse_page_ranges(text, max(page_indices) + 1):
+        if page_index not in page_numbers:
+            raise ValueError(f"Page {page_index + 1} is not loaded.")
+        loaded_page_numbers.append(page_numbers[page_index])
+    return loaded_page_numbers
+
+
+def image_to_bytes(image: Image.Image, compress_level: int = 6) -> bytes:
     output = io.BytesIO()
-    image.save(output, format="PNG")
+    image.save(output, format="PNG", compress_level=compress_level)
     return output.getvalue()
+
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class LRUCache(Generic[K, V]):
+    def __init__(self, max_size: int) -> None:
+        self._max_size = max_size
+        self._items: OrderedDict[K, V] = OrderedDict()
+
+    def get(self, key: K) -> Optional[V]:
+        if key not in self._items:
+            return None
+
+        self._items.move_to_end(key)
+        return self._items[key]
+
+    def put(self, key: K, value: V) -> None:
+        self._items[key] = value
+        self._items.move_to_end(key)
+        if len(self._items) > self._max_size:
+            self._items.popitem(last=False)
+
+    def clear(self) -> None:
+        self._items.clear()
+
+    def __len__(self) -> int:
+        return len(self._items)
@@ -0,0 +1,17 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+HEAVY_MODULES = ["cv2", "fitz", "FreeSimpleGUI", "tkinter"]
+
+
+@pytest.mark.parametrize(
+    "module", ["mocksign", "mocksign.pdf", "mocksign.signature", "mocksign.service", "mocksign.thumbnails"]
+)
+def test_import_does_not_load_heavy_modules(module: str) -> None:
+    code = f"import sys, {module}; print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, env=env)
+    assert result.stdout.strip() == ""
@@ -0,0 +1,79 @@
+import pathlib as pl
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+import fitz
+import pytest
+from PIL import Image
+
+from mocksign import filter
+from mocksign.pdf import PDF
+
+sg = pytest.importorskip("FreeSimpleGUI")
+from mocksign import mocksign  # noqa: E402
+
+
+class SlowFilter(filter.Filter):
+    def __init__(self) -> None:
+        super().__init__(name="Slow", enabled=True)
+
+    def _apply(self, image: Image.Image) -> Image.Image:
+        time.sleep(0.05)
+        return image
+
+
+class FakeElement:
+    def __getattr__(self, name: str) -> Callable[..., None]:
+        return lambda *args, **kwargs: None
+
+
+class FakeWindow:
+    def __init__(self, events: Iterator[Tuple[Optional[str], Dict[str, Any]]]) -> None:
+        self._events = events
+
+    def __getitem__(self, key: str) -> FakeElement:
+        return FakeElement()
+
+    def bind(self, *args: object) -> None:
+        pass
+
+    def read(self, timeout: Optional[int] = None) -> Tuple[Optional[str], Dict[str, Any]]:
+        return next(self._events)
+
+    def write_event_value(self, key: str, value: object) -> None:
+        # Like Tk, posting from a thread waits for the main thread, which never reads the window again after closing
+        threading.Event().wait()
+
+    def close(self) -> None:
+        pass
+
+
+def test_close_while_saving(tmp_path: pl.Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    pdf_path = tmp_path / "document.pdf"
+    document = fitz.Document()
+    for _ in range(20):
+        document.new_page(width=200, height=300)
+    document.save(pdf_path)
+    output_path = tmp_path / "output.pdf"
+
+    def events() -> Iterator[Tuple[Optional[str], Dict[str, Any]]]:
+        yield "-SAVE-", {}
+        # Let the save get past its first pages before closing the window
+        time.sleep(0.2)
+        yield sg.WIN_CLOSED, {}
+
+    monkeypatch.setattr(sg, "popup_get_file", lambda *args, **kwargs: str(output_path))
+    monkeypatch.setattr(sg, "popup_get_text", lambda *args, **kwargs: "")
+
+    app = mocksign.MockSign()
+    app._pdf = PDF(pdf_path, remove_signature_background=False)
+    app._filters = [SlowFilter()]
+    monkeypatch.setattr(app, "_create_window", lambda: FakeWindow(events()))
+
+    thread = threading.Thread(target=app.start, daemon=True)
+    thread.start()
+    thread.join(timeout=10)
+
+    assert not thread.is_alive()
+    assert [path.name for path in tmp_path.iterdir()] == ["document.pdf"]
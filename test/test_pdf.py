@@ -0,0 +1,146 @@
+import gc
+import pathlib as pl
+import threading
+
+import cv2
+import fitz
+import numpy as np
+import pytest
+from PIL import Image
+
+from mocksign.pdf import PDF
+from mocksign.signature import Signature
+
+
+@pytest.fixture
+def pdf_path(tmp_path: pl.Path) -> pl.Path:
+    path = tmp_path / "document.pdf"
+    document = fitz.Document()
+    for _ in range(3):
+        document.new_page(width=200, height=300)
+    document.save(path)
+    return path
+
+
+@pytest.mark.parametrize("grayscale,expected_mode", [(False, "RGB"), (True, "L")])
+@pytest.mark.parametrize("remove_background", [False, True])
+def test_get_page_image(pdf_path: pl.Path, grayscale: bool, expected_mode: str, remove_background: bool) -> None:
+    pdf = PDF(pdf_path, remove_signature_background=remove_background, grayscale=grayscale)
+    signature = Signature(Image.new("RGB", (40, 20), "blue"), location=(10, 100), scale=1.0)
+    pdf.place_signature(page_number=0, signature=signature, identifier=0)
+
+    page_image = pdf.get_page_image(0, signed=True)
+    assert page_image.mode == expected_mode
+    assert page_image.size == pdf.get_page_size(0) == (417, 625)
+
+
+def test_save_with_progress(pdf_path: pl.Path, tmp_path: pl.Path) -> None:
+    pdf = PDF(pdf_path, remove_signature_background=False)
+    output_path = tmp_path / "output.pdf"
+
+    progress = list(pdf.save_with_progress(output_path, filters=[]))
+    assert progress == [(1, 4), (2, 4), (3, 4), (4, 4)]
+    assert fitz.Document(output_path).page_count == 3
+
+
+def test_save_with_progress_cancelled(pdf_path: pl.Path, tmp_path: pl.Path) -> None:
+    pdf = PDF(pdf_path, remove_signature_background=False)
+
+    progress = pdf.save_with_progress(tmp_path / "output.pdf", filters=[])
+    next(progress)
+    progress.close()
+    assert [path.name for path in tmp_path.iterdir()] == ["document.pdf"]
+
+
+def test_save_with_progress_cancelled_before_encoding(pdf_path: pl.Path, tmp_path: pl.Path) -> None:
+    pdf = PDF(pdf_path, remove_signature_background=False)
+    cancel_event = threading.Event()
+
+    progress = pdf.save_with_progress(tmp_path / "output.pdf", filters=[], cancel_event=cancel_event)
+    assert [next(progress) for _ in range(3)] == [(1, 4), (2, 4), (3, 4)]
+    cancel_event.set()
+    assert list(progress) == []
+    assert [path.name for path in tmp_path.iterdir()] == ["document.pdf"]
+
+
+def test_close(pdf_path: pl.Path) -> None:
+    with PDF(pdf_path, remove_signature_background=False) as pdf:
+        # The input document can be replaced while it is loaded
+        pdf.save(pdf_path, filters=[], pages=[0])
+        assert pdf.num_pages == 3
+        pdf.render_tile(0, zoom=1.0, column=0, row=0, tile_size=256)
+
+    with pytest.raises(RuntimeError):
+        pdf.render_tile(0, zoom=1.0, column=0, row=0, tile_size=256)
+    assert fitz.Document(pdf_path).page_count == 1
+
+
+def test_set_grayscale(pdf_path: pl.Path) -> None:
+    pdf = PDF(pdf_path, remove_signature_background=False)
+    assert pdf.get_page_image(0, signed=False).mode == "RGB"
+
+    pdf.set_grayscale(True)
+    assert pdf.get_page_image(0, signed=False).mode == "L"
+    assert pdf.get_page_size(0) == (417, 625)
+    # Tiles are used for editing and stay in colour
+    assert pdf.render_tile(0, zoom=1.0, column=0, row=0, tile_size=256).mode == "RGB"
+
+
+def test_render_tile(pdf_path: pl.Path) -> None:
+    pdf = PDF(pdf_path, remove_signature_background=False)
+    page_image = pdf.get_page_image(0, signed=False)
+
+    assert pdf.render_tile(0, zoom=1.0, column=1, row=0, tile_size=256) == page_image.crop((256, 0, 417, 256))
+    assert pdf.render_tile(0, zoom=2.0, column=1, row=4, tile_size=256).size == (256, 226)
+
+
+def test_get_page_image_multiple_signatures(pdf_path: pl.Path) -> None:
+    pdf = PDF(pdf_path, remove_signature_background=True)
+    signature_image = Image.new("RGB", (60, 30), "blue")
+    locations = [(10, 100), (40, 110), (380, 20)]
+    for identifier, location in enumerate(locations):
+        pdf.place_signature(0, Signature(signature_image, location=location, scale=1.0), identifier)
+
+    # Reference: clone each signature into a separate copy of the page
+    expected_array = np.array(pdf.get_page_image(0, signed=False))
+    for x, y in locations:
+        y = expected_array.shape[0] - y
+        cropped_signature = np.array(signature_image)[: expected_array.shape[0] - y, : expected_array.shape[1] - x]
+        center = (x + cropped_signature.shape[1] // 2, y + cropped_signature.shape[0] // 2)
+        mask = np.ones_like(cropped_signature) * 255
+        expected_array = cv2.seamlessClone(cropped_signature, expected_array, mask, center, cv2.MIXED_CLONE)
+
+    assert np.array_equal(np.array(pdf.get_page_image(0, signed=True)), expected_array)
+    assert pdf.get_page_image(0, signed=False) == Image.new("RGB", (417, 625), "white")
+
+
+def test_page_selection(pdf_path: pl.Path, tmp_path: pl.Path) -> None:
+    document = fitz.Document(pdf_path)
+    document[2].set_mediabox(fitz.Rect(0, 0, 100, 100))
+    document.saveIncr()
+
+    pdf = PDF(pdf_path, remove_signature_background=False, pages=[2, 0])
+    assert pdf.num_pages == 2
+    assert pdf.page_indices == [2, 0]
+    assert pdf.get_page_size(0) == (209, 209)
+
+    output_path = tmp_path / "output.pdf"
+    pdf.save(output_path, filters=[], pages=[1])
+    assert fitz.Document(output_path).page_count == 1
+
+    with pytest.raises(RuntimeError):
+        PDF(pdf_path, remove_signature_background=False, pages=[3])
+
+
+def test_save_with_progress_after_rasterizing_again(pdf_path: pl.Path, tmp_path: pl.Path) -> None:
+    pdf = PDF(pdf_path, remove_signature_background=False)
+    output_path = tmp_path / "output.pdf"
+
+    # Page images taken for saving must stay valid when the pages they were rendered from are replaced
+    pdf.get_page_image(0, signed=False)
+    pdf.get_page_image(2, signed=False)
+    progress = pdf.save_with_progress(output_path, filters=[])
+    pdf.set_grayscale(True)
+    gc.collect()
+    list(progress)
+    assert fitz.Document(output_path).page_count == 3
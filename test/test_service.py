@@ -0,0 +1,135 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+from http.server import ThreadingHTTPServer
+from typing import Any, Dict, Generator, Tuple
+
+import fitz
+import pytest
+
+from mocksign import service
+
+
+@pytest.fixture
+def pdf_bytes() -> bytes:
+    document = fitz.Document()
+    document.new_page(width=200, height=300)
+    document.new_page(width=200, height=300)
+    return document.tobytes()
+
+
+@pytest.fixture(scope="module")
+def signing_service() -> Generator[service.SigningService, None, None]:
+    signing_service = service.SigningService(service.DEFAULT_SIGNATURE_DIR, max_workers=1, max_queue=0)
+    signing_service.warm_up()
+    yield signing_service
+    signing_service.shutdown()
+
+
+@pytest.fixture
+def server_url(signing_service: service.SigningService) -> Generator[str, None, None]:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), service._create_handler(signing_service))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+def test_parse_spec() -> None:
+    spec = service.parse_spec(
+        {
+            "signatures": [{"page": 1, "signature": "Signature 1", "location": [10, 20]}],
+            "filters": {"Rotate": {"enabled": False}},
+            "remove_signature_background": False,
+        }
+    )
+    assert spec == service.SigningSpec(
+        signatures=[service.SignaturePlacement(page=1, signature="Signature 1", location=(10, 20), scale=1.0)],
+        filters={"Rotate": {"enabled": False}},
+        remove_signature_background=False,
+    )
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {"filters": {"Unknown": {}}},
+        {"filters": {"Blur": {"radius": 2}}},
+        {"signatures": [{"page": 0, "location": [0, 0]}]},
+        {"signatures": 5},
+        {"remove_signature_background": "false"},
+    ],
+)
+def test_parse_spec_invalid(data: Dict[str, Any]) -> None:
+    with pytest.raises(ValueError):
+        service.parse_spec(data)
+
+
+def test_sign_document(pdf_bytes: bytes, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(service, "_worker_signatures", {})
+    service._init_worker(str(service.DEFAULT_SIGNATURE_DIR))
+    spec = service.parse_spec({"signatures": [{"page": 1, "signature": "Signature 1", "location": [20, 200]}]})
+
+    signed_pdf = fitz.Document(stream=service._sign_document(pdf_bytes, spec))
+    assert signed_pdf.page_count == 2
+
+    with pytest.raises(ValueError):
+        service._sign_document(
+            pdf_bytes, service.parse_spec({"signatures": [{"page": 2, "signature": "Signature 1", "location": [0, 0]}]})
+        )
+
+
+def test_sign(signing_service: service.SigningService, pdf_bytes: bytes) -> None:
+    spec = service.parse_spec({"signatures": [{"page": 0, "signature": "Signature 1", "location": [20, 200]}]})
+    assert fitz.Document(stream=signing_service.sign(pdf_bytes, spec)).page_count == 2
+
+    # Holding the only slot stands in for a request in flight, as the service has one worker and no queue
+    assert signing_service._slots.acquire(blocking=False)
+    try:
+        with pytest.raises(service.ServiceBusyError):
+            signing_service.sign(pdf_bytes, spec)
+    finally:
+        signing_service._slots.release()
+
+
+def _post(url: str, pdf_bytes: bytes, spec: Dict[str, Any]) -> Tuple[int, bytes]:
+    request = urllib.request.Request(
+        url, data=pdf_bytes, headers={service.SPEC_HEADER: json.dumps(spec)}, method="POST"
+    )
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.read()
+
+
+@pytest.mark.parametrize(
+    "endpoint,spec,expected_status",
+    [
+        ("/sign", {"signatures": [{"page": 5, "signature": "Signature 1", "location": [20, 200]}]}, 400),
+        ("/sign", {"signatures": 5}, 400),
+        ("/unknown", {}, 404),
+    ],
+)
+def test_http_handler_error(
+    server_url: str, pdf_bytes: bytes, endpoint: str, spec: Dict[str, Any], expected_status: int
+) -> None:
+    status, _ = _post(server_url + endpoint, pdf_bytes, spec)
+    assert status == expected_status
+
+
+def test_http_handler(signing_service: service.SigningService, server_url: str, pdf_bytes: bytes) -> None:
+    spec = {"signatures": [{"page": 1, "signature": "Signature 1", "location": [20, 200]}]}
+    status, body = _post(server_url + "/sign", pdf_bytes, spec)
+    assert status == 200
+    assert fitz.Document(stream=body).page_count == 2
+
+    assert signing_service._slots.acquire(blocking=False)
+    try:
+        status, _ = _post(server_url + "/sign", pdf_bytes, spec)
+        assert status == 503
+    finally:
+        signing_service._slots.release()
@@ -0,0 +1,26 @@
+import io
+import pathlib as pl
+
+import fitz
+from PIL import Image
+
+from mocksign import thumbnails
+
+
+def test_iter_thumbnails(tmp_path: pl.Path) -> None:
+    pdf_path = tmp_path / "document.pdf"
+    document = fitz.Document()
+    document.new_page(width=200, height=300)
+    document.new_page(width=600, height=300)
+    document.new_page(width=200, height=300)
+    document.save(pdf_path)
+    cache_dir = tmp_path / "cache"
+
+    rendered = list(thumbnails.iter_thumbnails(pdf_path, [2, 1], size=(40, 50), cache_dir=cache_dir))
+    assert [page_number for page_number, _ in rendered] == [0, 1]
+    assert Image.open(io.BytesIO(rendered[0][1])).size == (34, 50)
+    assert Image.open(io.BytesIO(rendered[1][1])).size == (40, 20)
+
+    document_cache_dir = cache_dir / thumbnails.hash_document(pdf_path.read_bytes())
+    assert sorted(path.name for path in document_cache_dir.iterdir()) == ["1_40x50.png", "2_40x50.png"]
+    assert list(thumbnails.iter_thumbnails(pdf_path, [2, 1], size=(40, 50), cache_dir=cache_dir)) == rendered
@@ -1,4 +1,4 @@
-from typing import Tuple
+from typing import List, Optional, Tuple
 
 import pytest
 from PIL import Image
@@ -41,3 +41,83 @@ def test_resize_and_pad_image() -> None:
     expected_image = Image.new("RGB", (500, 600), "gray")
     expected_image.paste(Image.new("RGB", (368, 600), "red"), (66, 0))
     assert expected_image == target_image
+
+
+@pytest.mark.parametrize(
+    "zoom,center,expected_viewport",
+    [
+        (1.0, None, utils.Viewport(left=0, top=-40, scale=2.0, size=(100, 100))),
+        (4.0, None, utils.Viewport(left=75, top=35, scale=0.5, size=(100, 100))),
+        (4.0, (10, 150), utils.Viewport(left=0, top=70, scale=0.5, size=(100, 100))),
+    ],
+)
+def test_calculate_viewport(
+    zoom: float,
+    center: Optional[Tuple[float, float]],
+    expected_viewport: utils.Viewport,
+) -> None:
+    viewport = utils.calculate_viewport((200, 120), (100, 100), zoom=zoom, center=center)
+    assert viewport == expected_viewport
+
+
+def test_get_visible_tiles() -> None:
+    viewport = utils.Viewport(left=75, top=35, scale=0.5, size=(100, 100))
+    assert utils.get_visible_tiles((200, 120), viewport, tile_size=64) == [(2, 1), (3, 1), (2, 2), (3, 2)]
+
+
+def test_render_viewport() -> None:
+    image = Image.new("RGB", (200, 120), "red")
+    viewport_image = utils.render_viewport(image, utils.Viewport(left=0, top=-40, scale=2.0, size=(100, 100)))
+    expected_image = Image.new("RGB", (100, 100), "gray")
+    expected_image.paste(Image.new("RGB", (100, 60), "red"), (0, 20))
+    assert expected_image == viewport_image
+
+
+def test_lru_cache() -> None:
+    cache: utils.LRUCache[str, int] = utils.LRUCache(max_size=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert len(cache) == 2
+
+
+@pytest.mark.parametrize(
+    "text,expected_page_numbers",
+    [
+        ("", [0, 1, 2, 3, 4]),
+        ("2", [1]),
+        ("1-2, 4", [0, 1, 3]),
+        ("4-, 1", [3, 4, 0]),
+        ("-2,2-3", [0, 1, 2]),
+    ],
+)
+def test_parse_page_ranges(text: str, expected_page_numbers: List[int]) -> None:
+    assert utils.parse_page_ranges(text, num_pages=5) == expected_page_numbers
+
+
+@pytest.mark.parametrize("text", ["0", "6", "3-2", "a", "1-b", ","])
+def test_parse_page_ranges_invalid(text: str) -> None:
+    with pytest.raises(ValueError):
+        utils.parse_page_ranges(text, num_pages=5)
+
+
+@pytest.mark.parametrize(
+    "text,expected_page_numbers",
+    [
+        ("", [0, 1, 2]),
+        ("5-6", [1, 2]),
+        ("6, 3", [2, 0]),
+        ("5-", [1, 2]),
+    ],
+)
+def test_parse_loaded_page_ranges(text: str, expected_page_numbers: List[int]) -> None:
+    assert utils.parse_loaded_page_ranges(text, page_indices=[2, 4, 5]) == expected_page_numbers
+
+
+@pytest.mark.parametrize("text", ["1", "3-5", "7"])
+def test_parse_loaded_page_ranges_invalid(text: str) -> None:
+    with pytest.raises(ValueError):
+        utils.parse_loaded_page_ranges(text, page_indices=[2, 4, 5])